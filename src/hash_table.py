@@ -2,41 +2,65 @@
 Implementation of the optimal open addressing hash table without reordering.
 """
 
-from typing import Optional, Any, List, Tuple
+from typing import Optional, Any, Iterable, List, Tuple
+import array
 import math
 import random
 
+# Outcomes of SubArray.insert; FULL is falsy so the result can be used as a
+# success flag.
+FULL = 0
+INSERTED = 1
+UPDATED = 2
+
+# Marks an empty slot in key arrays, so that None remains a valid key.
+_EMPTY = object()
+
+# Key hashes are mixed once by multiplying with this odd 64-bit constant
+# (Fibonacci hashing); positions are then taken from the high bits of the
+# product, which depend on all bits of the hash, so keys whose hashes share
+# their low bits (such as strided ints, which hash to themselves) still
+# spread out.
+_MIX = 0x9E3779B97F4A7C15
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+
+# Range of keys IntSubArray can store in its signed 64-bit key array.
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
 class SubArray:
     """A subarray in the hash table."""
     
-    def __init__(self, size: int):
+    __slots__ = ('_size', '_mask', '_shift', '_limit', '_hashes', '_keys', '_values', '_count')
+    
+    def __init__(self, size: int, max_load: float = 1.0):
         """
         Initialize the subarray.
         
         Args:
-            size: Size of the subarray.
+            size: Size of the subarray, rounded up to a power of two.
+            max_load: Load factor at which no new keys are accepted;
+                existing keys can still be updated.
         """
+        size = self._init_size(size, max_load)
+        # Parallel arrays: probing compares the hashes before the keys, and
+        # a slot is empty while its key is _EMPTY. Hashes are kept unboxed
+        # in a 64-bit typed array, eight to a cache line.
+        self._hashes = array.array('q', bytes(8 * size))
+        self._keys: List[Any] = [_EMPTY] * size
+        self._values: List[Any] = [None] * size
+        
+    def _init_size(self, size: int, max_load: float) -> int:
+        """Set up the size-derived attributes and return the rounded size."""
+        size = 1 << (size - 1).bit_length() if size > 1 else 1
         self._size = size
-        self._table = [None] * size
+        self._mask = size - 1
+        self._shift = 64 - (size.bit_length() - 1)  # Home slot from the top bits of the mix
+        self._limit = max(1, int(size * max_load))
         self._count = 0
+        return size
         
-    def _hash(self, key: Any, attempt: int = 0) -> int:
-        """
-        Calculate the hash value for a key.
-        
-        Args:
-            key: The key to hash.
-            attempt: The probe attempt number.
-            
-        Returns:
-            The hash value.
-        """
-        # Use double hashing
-        h1 = hash(key) % self._size
-        h2 = 1 + (hash(str(key)) % (self._size - 1))
-        return (h1 + attempt * h2) % self._size
-        
-    def insert(self, key: Any, value: Any, max_probes: int) -> bool:
+    def insert(self, key: Any, value: Any, max_probes: int) -> int:
         """
         Try to insert a key-value pair into the subarray.
         
@@ -46,25 +70,32 @@ class SubArray:
             max_probes: Maximum number of probes to try.
             
         Returns:
-            True if insertion was successful, False otherwise.
+            INSERTED if the key was added, UPDATED if an existing key's value
+            was replaced, or FULL if no slot was found within max_probes.
         """
-        # First check if the key already exists
-        for i in range(max_probes):
-            pos = self._hash(key, i)
-            if self._table[pos] is None:
-                break
-            if self._table[pos][0] == key:
-                self._table[pos] = (key, value)  # Update value
-                return True
-                
-        # Try to find an empty slot
-        for i in range(max_probes):
-            pos = self._hash(key, i)
-            if self._table[pos] is None:
-                self._table[pos] = (key, value)
+        # Linear probing: the key is hashed and mixed once and consecutive
+        # slots are visited, so an existing key is always found before the
+        # first empty slot of its probe sequence.
+        hashes = self._hashes
+        keys = self._keys
+        mask = self._mask
+        h = hash(key)
+        start = ((h * _MIX) & _MASK64) >> self._shift
+        for i in range(min(max_probes, self._size)):
+            pos = (start + i) & mask
+            stored = keys[pos]
+            if stored is _EMPTY:
+                if self._count >= self._limit:
+                    return FULL
+                hashes[pos] = h
+                keys[pos] = key
+                self._values[pos] = value
                 self._count += 1
-                return True
-        return False
+                return INSERTED
+            if hashes[pos] == h and (stored is key or stored == key):
+                self._values[pos] = value  # Update value
+                return UPDATED
+        return FULL
         
     def search(self, key: Any) -> Optional[Any]:
         """
@@ -76,13 +107,18 @@ class SubArray:
         Returns:
             The value associated with the key, or None if not found.
         """
-        max_probes = self._size  # Try all possible positions
-        for i in range(max_probes):
-            pos = self._hash(key, i)
-            if self._table[pos] is None:
+        hashes = self._hashes
+        keys = self._keys
+        mask = self._mask
+        h = hash(key)
+        start = ((h * _MIX) & _MASK64) >> self._shift
+        for i in range(self._size):  # Try all possible positions
+            pos = (start + i) & mask
+            stored = keys[pos]
+            if stored is _EMPTY:
                 return None
-            if self._table[pos][0] == key:
-                return self._table[pos][1]
+            if hashes[pos] == h and (stored is key or stored == key):
+                return self._values[pos]
         return None
         
     @property
@@ -95,9 +131,91 @@ class SubArray:
         """
         return self._count / self._size
 
+class IntSubArray(SubArray):
+    """A subarray specialized for int keys, stored unboxed in a typed array."""
+    
+    __slots__ = ()
+    
+    def __init__(self, size: int, max_load: float = 1.0):
+        """
+        Initialize the subarray.
+        
+        Args:
+            size: Size of the subarray, rounded up to a power of two.
+            max_load: Load factor at which no new keys are accepted;
+                existing keys can still be updated.
+        """
+        size = self._init_size(size, max_load)
+        # An int is its own hash, so no hashes are stored. Keys live in a
+        # 64-bit typed array and a slot is empty while its value is _EMPTY.
+        self._hashes = None
+        self._keys = array.array('q', bytes(8 * size))
+        self._values: List[Any] = [_EMPTY] * size
+        
+    def insert(self, key: int, value: Any, max_probes: int) -> int:
+        """
+        Try to insert a key-value pair into the subarray.
+        
+        Args:
+            key: The int key to insert; must fit in a signed 64-bit integer.
+            value: The value to insert.
+            max_probes: Maximum number of probes to try.
+            
+        Returns:
+            INSERTED if the key was added, UPDATED if an existing key's value
+            was replaced, or FULL if no slot was found within max_probes.
+        """
+        keys = self._keys
+        values = self._values
+        mask = self._mask
+        start = ((key * _MIX) & _MASK64) >> self._shift
+        for i in range(min(max_probes, self._size)):
+            pos = (start + i) & mask
+            if values[pos] is _EMPTY:
+                if self._count >= self._limit:
+                    return FULL
+                keys[pos] = key
+                values[pos] = value
+                self._count += 1
+                return INSERTED
+            if keys[pos] == key:
+                values[pos] = value  # Update value
+                return UPDATED
+        return FULL
+        
+    def search(self, key: int) -> Optional[Any]:
+        """
+        Search for a key in the subarray.
+        
+        Args:
+            key: The int key to search for.
+            
+        Returns:
+            The value associated with the key, or None if not found or not
+            an int.
+        """
+        if not isinstance(key, int):
+            return None
+        keys = self._keys
+        values = self._values
+        mask = self._mask
+        start = ((key * _MIX) & _MASK64) >> self._shift
+        for i in range(self._size):  # Try all possible positions
+            pos = (start + i) & mask
+            value = values[pos]
+            if value is _EMPTY:
+                return None
+            if keys[pos] == key:
+                return value
+        return None
+
 class LastSubArray:
     """Special implementation for the last subarray (Aα+1)."""
     
+    __slots__ = ('_size', '_b_size', '_b_mask', '_b_shift', '_c_size', '_max_attempts',
+                 '_c_mask', '_c_shift', '_bucket_size', '_b_hashes', '_b_keys', '_b_values',
+                 '_c_hashes', '_c_keys', '_c_values', '_c_counts', '_count')
+    
     def __init__(self, size: int):
         """
         Initialize the last subarray with two parts: B and C.
@@ -106,27 +224,51 @@ class LastSubArray:
             size: Total size of the subarray.
         """
         self._size = size
-        self._b_size = size // 2
+        # Part B and the number of part-C buckets are powers of two so that
+        # positions are computed with a mask rather than a modulo. B takes
+        # the power of two nearest to half the subarray (ties round down)
+        # and C the remainder, so B holds between 1/3 and 2/3 of the slots
+        # rather than the paper's exact half.
+        half = max(1, size // 2)
+        low = 1 << (half.bit_length() - 1)
+        self._b_size = 2 * low if 2 * low - half < half - low else low
+        self._b_mask = self._b_size - 1
         self._c_size = size - self._b_size
-        self._bucket_size = 2 * int(math.log2(math.log2(size + 1) + 1))
-        self._b = [None] * self._b_size  # Uniform probing
-        self._c = [[None] * self._bucket_size for _ in range((self._c_size + self._bucket_size - 1) // self._bucket_size)]  # Two-choice with buckets
+        self._max_attempts = int(math.log2(math.log2(size + 1) + 1))
+        bucket_size = 2 * self._max_attempts
+        num_buckets = 1 << (max(1, self._c_size // bucket_size).bit_length() - 1)
+        self._c_mask = num_buckets - 1
+        self._bucket_size = -(-self._c_size // num_buckets)
+        # Bit offsets into the mixed hash: the first bucket choice takes
+        # the top bits and part B the bits just below them.
+        self._c_shift = 64 - (num_buckets.bit_length() - 1)
+        self._b_shift = self._c_shift - (self._b_size.bit_length() - 1)
+        # Uniform probing, hashes, keys and values in parallel arrays
+        self._b_hashes = array.array('q', bytes(8 * self._b_size))
+        self._b_keys: List[Any] = [_EMPTY] * self._b_size
+        self._b_values: List[Any] = [None] * self._b_size
+        # Two-choice with buckets, stored back to back in flat parallel
+        # arrays. Bucket b starts at b * bucket_size and, as nothing is
+        # deleted, its entries fill it from the start, so only the first
+        # _c_counts[b] slots of a bucket are ever scanned.
+        c_slots = num_buckets * self._bucket_size
+        self._c_hashes = array.array('q', bytes(8 * c_slots))
+        self._c_keys: List[Any] = [_EMPTY] * c_slots
+        self._c_values: List[Any] = [None] * c_slots
+        self._c_counts = array.array('i', [0] * num_buckets)  # Entries per bucket
         self._count = 0
         
-    def _hash_b(self, key: Any, attempt: int = 0) -> int:
-        """Hash function for part B."""
-        h1 = hash(key) % self._b_size
-        h2 = 1 + (hash(str(key)) % (self._b_size - 1))
-        return (h1 + attempt * h2) % self._b_size
+    def _hash_b(self, m: int, attempt: int = 0) -> int:
+        """Linear probe position in part B for a mixed key hash."""
+        return ((m >> self._b_shift) + attempt) & self._b_mask
         
-    def _hash_c(self, key: Any) -> Tuple[int, int]:
+    def _hash_c(self, m: int) -> Tuple[int, int]:
         """Hash function for part C, returns two bucket indices."""
-        num_buckets = len(self._c)
-        h1 = hash(key) % num_buckets
-        h2 = (h1 + 1 + hash(str(key)) % (num_buckets - 1)) % num_buckets
-        return h1, h2
+        # Both choices come from high bits of the mixed hash: its top bits
+        # and the bits above bit 32.
+        return m >> self._c_shift, (m >> 32) & self._c_mask
         
-    def insert(self, key: Any, value: Any) -> bool:
+    def insert(self, key: Any, value: Any) -> int:
         """
         Insert a key-value pair into the last subarray.
         
@@ -135,52 +277,64 @@ class LastSubArray:
             value: The value to insert.
             
         Returns:
-            True if insertion was successful, False otherwise.
+            INSERTED if the key was added, UPDATED if an existing key's value
+            was replaced, or FULL if there was no room for it.
         """
-        # First check if the key exists in part B
-        max_attempts = int(math.log2(math.log2(self._size + 1) + 1))
-        for i in range(max_attempts):
-            pos = self._hash_b(key, i)
-            if self._b[pos] is not None and self._b[pos][0] == key:
-                self._b[pos] = (key, value)  # Update value
-                return True
-                
-        # Then check if the key exists in part C
-        b1, b2 = self._hash_c(key)
-        for bucket in [self._c[b1], self._c[b2]]:
-            for i, item in enumerate(bucket):
-                if item is not None and item[0] == key:
-                    bucket[i] = (key, value)  # Update value
-                    return True
-                    
-        # Try to insert into part B
-        for i in range(max_attempts):
-            pos = self._hash_b(key, i)
-            if self._b[pos] is None:
-                self._b[pos] = (key, value)
+        h = hash(key)
+        m = (h * _MIX) & _MASK64
+        
+        # Update or insert in part B. With linear probing and no deletions
+        # an existing key is met before the first empty slot, and a key
+        # that went to part C found this whole window full, so an empty
+        # slot means the key is new.
+        b_hashes = self._b_hashes
+        b_keys = self._b_keys
+        for i in range(self._max_attempts):
+            pos = self._hash_b(m, i)
+            stored = b_keys[pos]
+            if stored is _EMPTY:
+                b_hashes[pos] = h
+                b_keys[pos] = key
+                self._b_values[pos] = value
                 self._count += 1
-                return True
+                return INSERTED
+            if b_hashes[pos] == h and (stored is key or stored == key):
+                self._b_values[pos] = value  # Update value
+                return UPDATED
                 
-        # If B fails, try part C
-        b1, b2 = self._hash_c(key)
-        bucket1 = self._c[b1]
-        bucket2 = self._c[b2]
-        
-        # Count empty slots in each bucket
-        empty1 = sum(1 for x in bucket1 if x is None)
-        empty2 = sum(1 for x in bucket2 if x is None)
-        
-        # Choose the bucket with more empty slots
-        target_bucket = bucket1 if empty1 >= empty2 else bucket2
-        
-        # Try to insert into the chosen bucket
-        for i in range(self._bucket_size):
-            if target_bucket[i] is None:
-                target_bucket[i] = (key, value)
-                self._count += 1
-                return True
+        # B's window is full, so check if the key exists in part C. Both
+        # candidate buckets are checked in turn without building a
+        # container for them.
+        c_hashes = self._c_hashes
+        c_keys = self._c_keys
+        counts = self._c_counts
+        bucket_size = self._bucket_size
+        b1, b2 = self._hash_c(m)
+        base = b1 * bucket_size
+        for pos in range(base, base + counts[b1]):
+            if c_hashes[pos] == h and (c_keys[pos] is key or c_keys[pos] == key):
+                self._c_values[pos] = value  # Update value
+                return UPDATED
+        base = b2 * bucket_size
+        for pos in range(base, base + counts[b2]):
+            if c_hashes[pos] == h and (c_keys[pos] is key or c_keys[pos] == key):
+                self._c_values[pos] = value  # Update value
+                return UPDATED
                 
-        return False
+        # Otherwise insert into the candidate bucket with more empty slots
+        target = b1 if counts[b1] <= counts[b2] else b2
+        count = counts[target]
+        if count == bucket_size:
+            return FULL
+            
+        # Append to the chosen bucket
+        pos = target * bucket_size + count
+        c_hashes[pos] = h
+        c_keys[pos] = key
+        self._c_values[pos] = value
+        counts[target] = count + 1
+        self._count += 1
+        return INSERTED
         
     def search(self, key: Any) -> Optional[Any]:
         """
@@ -192,22 +346,35 @@ class LastSubArray:
         Returns:
             The value associated with the key, or None if not found.
         """
+        h = hash(key)
+        m = (h * _MIX) & _MASK64
+        
         # Search in part B
-        max_attempts = int(math.log2(math.log2(self._size + 1) + 1))
-        for i in range(max_attempts):
-            pos = self._hash_b(key, i)
-            if self._b[pos] is None:
+        b_hashes = self._b_hashes
+        b_keys = self._b_keys
+        for i in range(self._max_attempts):
+            pos = self._hash_b(m, i)
+            stored = b_keys[pos]
+            if stored is _EMPTY:
                 break
-            if self._b[pos][0] == key:
-                return self._b[pos][1]
+            if b_hashes[pos] == h and (stored is key or stored == key):
+                return self._b_values[pos]
                 
         # Search in part C
-        b1, b2 = self._hash_c(key)
-        for bucket in [self._c[b1], self._c[b2]]:
-            for item in bucket:
-                if item is not None and item[0] == key:
-                    return item[1]
-                    
+        c_hashes = self._c_hashes
+        c_keys = self._c_keys
+        counts = self._c_counts
+        bucket_size = self._bucket_size
+        b1, b2 = self._hash_c(m)
+        base = b1 * bucket_size
+        for pos in range(base, base + counts[b1]):
+            if c_hashes[pos] == h and (c_keys[pos] is key or c_keys[pos] == key):
+                return self._c_values[pos]
+        base = b2 * bucket_size
+        for pos in range(base, base + counts[b2]):
+            if c_hashes[pos] == h and (c_keys[pos] is key or c_keys[pos] == key):
+                return self._c_values[pos]
+                
         return None
         
     @property
@@ -225,29 +392,59 @@ class OpenAddressHashTable:
     A hash table implementation using open addressing without reordering.
     """
     
-    def __init__(self, initial_size: int = 16, delta: float = 0.1):
+    def __init__(self, initial_size: int = 16, delta: float = 0.1, layout: str = "cascaded",
+                 key_type: Optional[type] = None):
         """
         Initialize the hash table.
         
         Args:
             initial_size: Initial size of the hash table.
-            delta: The target empty space ratio (between 0 and 1).
+            delta: The target empty space ratio (between 0 and 1). New keys
+                are refused once the load factor reaches 1 - delta, both for
+                the table as a whole and for each cascaded subarray.
+            layout: "cascaded" for the geometrically decreasing subarrays of
+                the paper, or "flat" for a single linear-probing table of
+                initial_size rounded up to a power of two.
+            key_type: The type of all keys, if known. int selects subarrays
+                specialized for int keys, which must then fit in a signed
+                64-bit integer; other types use the generic ones.
         """
+        if layout not in ("cascaded", "flat"):
+            raise ValueError(f"Unknown layout: {layout!r}")
         self._size = initial_size
         self._delta = delta
+        # New keys are refused once the table, or an individual subarray,
+        # reaches this load factor. A subarray at its limit still probes for
+        # existing keys, but stops filling, which bounds its clusters.
+        self._max_load = 1 - delta
+        self._layout = layout
+        self._key_type = key_type
         self._count = 0
+        subarray_class = IntSubArray if key_type is int else SubArray
         
         # Calculate number of subarrays
         self._alpha = int(math.log2(1/delta) / 3)
+        self._max_probes = int(math.log2(1/delta))
         
-        # Initialize subarrays with geometrically decreasing sizes
         self._subarrays: List[SubArray] = []
+        if layout == "flat":
+            self._subarrays.append(subarray_class(initial_size))
+            self._size = self._subarrays[0]._size
+            self._max_probes = self._size
+            self._last_array = None
+            return
+            
+        # Initialize subarrays with geometrically decreasing power-of-two
+        # sizes; rounding down keeps the total within initial_size and the
+        # remainder goes to the last subarray.
         current_size = initial_size // 2
+        if current_size > 0:
+            current_size = 1 << (current_size.bit_length() - 1)
         for i in range(self._alpha):
             size = current_size // (2 ** i)
             if size < 1:
                 break
-            self._subarrays.append(SubArray(size))
+            self._subarrays.append(subarray_class(size, self._max_load))
             
         # Initialize the last subarray
         last_size = initial_size - sum(arr._size for arr in self._subarrays)
@@ -266,36 +463,70 @@ class OpenAddressHashTable:
             
         Returns:
             True if insertion was successful, False otherwise.
+            
+        Raises:
+            TypeError: If the table was created with key_type=int and the
+                key is not an int.
+            ValueError: If the table was created with key_type=int and the
+                key does not fit in a signed 64-bit integer.
         """
-        # First try to find if the key already exists
-        for subarray in self._subarrays:
-            max_probes = int(math.log2(1/self._delta))
-            if subarray.search(key) is not None:
-                return subarray.insert(key, value, max_probes)
-                
-        if self._last_array is not None and self._last_array.search(key) is not None:
-            return self._last_array.insert(key, value)
+        if self._key_type is int:
+            self._check_int_key(key)
+        if self._layout == "flat":
+            return self._insert_flat(key, value)
             
-        # Key doesn't exist, try to insert it
-        # Calculate current load factor
-        current_load = self.load_factor
-        if current_load >= 0.9:  # If load factor is too high, don't insert
-            return False
+        # If load factor is too high, only existing keys may be updated
+        if self.load_factor >= self._max_load:
+            return self._update_existing(key, value)
             
-        # Try each subarray in order
+        # Try each subarray in order. A single pass both updates and
+        # inserts: with linear probing and no deletions, a key stored in a
+        # later subarray found every earlier probe window full or its
+        # subarray at max load, both of which persist, so earlier subarrays
+        # report FULL for it.
         for subarray in self._subarrays:
-            max_probes = int(math.log2(1/self._delta))
-            if subarray.insert(key, value, max_probes):
+            status = subarray.insert(key, value, self._max_probes)
+            if status == INSERTED:
                 self._count += 1
                 return True
+            if status == UPDATED:
+                return True
                 
         # If all subarrays fail, try the last array
-        if self._last_array is not None and self._last_array.insert(key, value):
-            self._count += 1
-            return True
+        if self._last_array is not None:
+            status = self._last_array.insert(key, value)
+            if status == INSERTED:
+                self._count += 1
+            return status != FULL
+            
+        return False
+        
+    def _check_int_key(self, key: Any) -> None:
+        """Check that a key can be stored in int-specialized subarrays."""
+        if not isinstance(key, int):
+            raise TypeError(f"key must be an int, not {type(key).__name__}")
+        if not _INT64_MIN <= key <= _INT64_MAX:
+            raise ValueError(f"int key out of 64-bit range: {key}")
             
+    def _update_existing(self, key: Any, value: Any) -> bool:
+        """Update the value of a key already in the table, adding nothing."""
+        for subarray in self._subarrays:
+            if subarray.search(key) is not None:
+                return subarray.insert(key, value, self._max_probes) != FULL
+        if self._last_array is not None and self._last_array.search(key) is not None:
+            return self._last_array.insert(key, value) != FULL
         return False
         
+    def _insert_flat(self, key: Any, value: Any) -> bool:
+        """Insert into the single table of the flat layout."""
+        table = self._subarrays[0]
+        if self.load_factor >= self._max_load and table.search(key) is None:
+            return False
+        status = table.insert(key, value, self._max_probes)
+        if status == INSERTED:
+            self._count += 1
+        return status != FULL
+        
     def search(self, key: Any) -> Optional[Any]:
         """
         Search for a key in the hash table.
@@ -304,8 +535,12 @@ class OpenAddressHashTable:
             key: The key to search for.
             
         Returns:
-            The value associated with the key, or None if not found.
+            The value associated with the key, or None if not found. On a
+            table created with key_type=int, non-int keys are never found.
         """
+        if self._key_type is int and not isinstance(key, int):
+            return None
+            
         # Search in each subarray
         for subarray in self._subarrays:
             result = subarray.search(key)
@@ -318,6 +553,37 @@ class OpenAddressHashTable:
             
         return None
         
+    def insert_many(self, keys: Iterable[Any], values: Iterable[Any]) -> List[bool]:
+        """
+        Insert many key-value pairs into the hash table.
+        
+        Args:
+            keys: The keys to insert.
+            values: The values to insert, paired with keys in order.
+            
+        Returns:
+            For each pair, True if insertion was successful, False otherwise.
+            
+        Raises:
+            ValueError: If keys and values differ in length; pairs before
+                the shorter input ran out have already been inserted.
+        """
+        insert = self.insert
+        return [insert(key, value) for key, value in zip(keys, values, strict=True)]
+        
+    def search_many(self, keys: Iterable[Any]) -> List[Optional[Any]]:
+        """
+        Search for many keys in the hash table.
+        
+        Args:
+            keys: The keys to search for.
+            
+        Returns:
+            For each key, the associated value, or None if not found.
+        """
+        search = self.search
+        return [search(key) for key in keys]
+        
     @property
     def load_factor(self) -> float:
         """
@@ -4,7 +4,7 @@ Tests for the OpenAddressHashTable implementation.
 
 import unittest
 import random
-from src.hash_table import OpenAddressHashTable, SubArray, LastSubArray
+from src.hash_table import OpenAddressHashTable, SubArray, IntSubArray, LastSubArray, FULL, INSERTED, UPDATED, _EMPTY
 
 class TestSubArray(unittest.TestCase):
     """Test cases for SubArray."""
@@ -16,9 +16,21 @@ class TestSubArray(unittest.TestCase):
     def test_init(self):
         """Test initialization."""
         self.assertEqual(self.subarray._size, 16)
-        self.assertEqual(len(self.subarray._table), 16)
+        self.assertEqual(len(self.subarray._hashes), 16)
+        self.assertEqual(len(self.subarray._keys), 16)
+        self.assertEqual(len(self.subarray._values), 16)
         self.assertEqual(self.subarray._count, 0)
+
+    def test_slots(self):
+        """Test that instances have no per-instance __dict__."""
+        self.assertFalse(hasattr(self.subarray, "__dict__"))
         
+    def test_size_rounded_to_power_of_two(self):
+        """Test that sizes are rounded up to a power of two."""
+        subarray = SubArray(20)
+        self.assertEqual(subarray._size, 32)
+        self.assertEqual(subarray._mask, 31)
+
     def test_insert_and_search(self):
         """Test insertion and search operations."""
         # Test successful insertion
@@ -32,6 +44,57 @@ class TestSubArray(unittest.TestCase):
         # Test search for non-existent key
         self.assertIsNone(self.subarray.search("key3"))
         
+    def test_update_existing_key(self):
+        """Test that inserting an existing key updates its value."""
+        self.assertEqual(self.subarray.insert("key1", "value1", 5), INSERTED)
+        self.assertEqual(self.subarray.insert("key1", "value2", 5), UPDATED)
+        self.assertEqual(self.subarray.search("key1"), "value2")
+        self.assertEqual(self.subarray._count, 1)
+        
+    def test_insert_full(self):
+        """Test that insertion reports FULL when no slot is free."""
+        subarray = SubArray(4)
+        for i in range(4):
+            self.assertEqual(subarray.insert(i, i, 4), INSERTED)
+        self.assertEqual(subarray.insert(4, 4, 4), FULL)
+        self.assertEqual(subarray.insert(0, "updated", 4), UPDATED)
+        
+    def test_eq_skipped_on_hash_mismatch(self):
+        """Test that keys are only compared when their hashes match."""
+        compared = []
+        
+        class Key:
+            def __init__(self, name, h):
+                self.name = name
+                self.h = h
+                
+            def __hash__(self):
+                return self.h
+                
+            def __eq__(self, other):
+                compared.append((self.name, other.name))
+                return self.name == other.name
+                
+        self.subarray.insert(Key("a", 1), "a", 5)
+        self.subarray.insert(Key("b", 22), "b", 5)  # Same home slot, different hash
+        self.assertEqual(self.subarray.search(Key("b", 22)), "b")
+        self.assertEqual(compared, [("b", "b")])
+        
+    def test_max_load(self):
+        """Test that new keys are refused once max_load is reached."""
+        subarray = SubArray(8, max_load=0.5)
+        for i in range(4):
+            self.assertEqual(subarray.insert(i, i, 8), INSERTED)
+        self.assertEqual(subarray.insert(4, 4, 8), FULL)
+        self.assertEqual(subarray.insert(0, "updated", 8), UPDATED)
+        self.assertEqual(subarray.search(0), "updated")
+        self.assertIsNone(subarray.search(4))
+        
+    def test_none_key(self):
+        """Test that None can be used as a key."""
+        self.assertEqual(self.subarray.insert(None, "value", 5), INSERTED)
+        self.assertEqual(self.subarray.search(None), "value")
+        
     def test_load_factor(self):
         """Test load factor calculation."""
         self.assertEqual(self.subarray.load_factor, 0.0)
@@ -42,6 +105,39 @@ class TestSubArray(unittest.TestCase):
         self.subarray.insert("key2", "value2", 5)
         self.assertEqual(self.subarray.load_factor, 2/16)
 
+class TestIntSubArray(unittest.TestCase):
+    """Test cases for IntSubArray."""
+    
+    def setUp(self):
+        """Set up test cases."""
+        self.subarray = IntSubArray(16)
+        
+    def test_insert_and_search(self):
+        """Test insertion, update and search operations."""
+        self.assertEqual(self.subarray.insert(5, "five", 5), INSERTED)
+        self.assertEqual(self.subarray.insert(21, "twenty-one", 5), INSERTED)  # Collides with 5
+        self.assertEqual(self.subarray.insert(-3, "minus three", 5), INSERTED)
+        self.assertEqual(self.subarray.insert(5, "FIVE", 5), UPDATED)
+        
+        self.assertEqual(self.subarray.search(5), "FIVE")
+        self.assertEqual(self.subarray.search(21), "twenty-one")
+        self.assertEqual(self.subarray.search(-3), "minus three")
+        self.assertIsNone(self.subarray.search(37))
+        self.assertEqual(self.subarray._count, 3)
+        
+    def test_insert_full(self):
+        """Test that insertion reports FULL when no slot is free."""
+        subarray = IntSubArray(4)
+        for i in range(4):
+            self.assertEqual(subarray.insert(i, i, 4), INSERTED)
+        self.assertEqual(subarray.insert(4, 4, 4), FULL)
+        
+    def test_search_non_int_key(self):
+        """Test that searching for a non-int key finds nothing."""
+        self.subarray.insert(2, "two", 5)
+        for key in ("a", 2.0, None):
+            self.assertIsNone(self.subarray.search(key))
+            
 class TestLastSubArray(unittest.TestCase):
     """Test cases for LastSubArray."""
     
@@ -55,12 +151,38 @@ class TestLastSubArray(unittest.TestCase):
         self.assertEqual(self.last_array._b_size, 16)
         self.assertEqual(self.last_array._count, 0)
         
+    def test_slots(self):
+        """Test that instances have no per-instance __dict__."""
+        self.assertFalse(hasattr(self.last_array, "__dict__"))
+        
+    def test_power_of_two_parts(self):
+        """Test that part B and the bucket count of part C are powers of two."""
+        last_array = LastSubArray(100)
+        self.assertEqual(last_array._b_size, 64)
+        self.assertEqual(last_array._b_mask, 63)
+        self.assertEqual(last_array._c_size, 36)
+        num_buckets = len(last_array._c_counts)
+        self.assertEqual(num_buckets & (num_buckets - 1), 0)
+        self.assertGreaterEqual(num_buckets * last_array._bucket_size, last_array._c_size)
+        
+    def test_b_size_nearest_half(self):
+        """Test that part B is the power of two nearest to half the size."""
+        for size, b_size in [(32, 16), (127, 64), (96, 32), (200, 128), (2, 1)]:
+            last_array = LastSubArray(size)
+            self.assertEqual(last_array._b_size, b_size)
+            self.assertEqual(last_array._c_size, size - b_size)
+            
     def test_insert_and_search_b(self):
         """Test insertion and search in part B."""
         # Test successful insertion in B
         self.assertTrue(self.last_array.insert("key1", "value1"))
         self.assertEqual(self.last_array.search("key1"), "value1")
         
+    def test_none_key_in_b(self):
+        """Test that None can be used as a key in part B."""
+        self.assertTrue(self.last_array.insert(None, "value"))
+        self.assertEqual(self.last_array.search(None), "value")
+        
     def test_insert_and_search_c(self):
         """Test insertion and search in part C."""
         # Fill part B to force insertion into C
@@ -74,6 +196,48 @@ class TestLastSubArray(unittest.TestCase):
         for i, key in enumerate(keys):
             self.assertEqual(self.last_array.search(key), f"value{i}")
             
+    def test_c_counts(self):
+        """Test that per-bucket counts track the entries in part C."""
+        for i in range(self.last_array._size):
+            self.last_array.insert(f"key{i}", f"value{i}")
+        bucket_size = self.last_array._bucket_size
+        c_keys = self.last_array._c_keys
+        for b, count in enumerate(self.last_array._c_counts):
+            bucket = c_keys[b * bucket_size:(b + 1) * bucket_size]
+            # Entries are packed at the start of each bucket
+            self.assertTrue(all(key is not _EMPTY for key in bucket[:count]))
+            self.assertTrue(all(key is _EMPTY for key in bucket[count:]))
+        self.assertEqual(sum(self.last_array._c_counts),
+                         self.last_array._count - sum(key is not _EMPTY for key in self.last_array._b_keys))
+            
+    def test_update_in_c(self):
+        """Test updating keys stored in single- and multi-entry buckets."""
+        keys = [f"key{i}" for i in range(self.last_array._size)]
+        keys = [key for key in keys if self.last_array.insert(key, "old")]
+        count = self.last_array._count
+        
+        for key in keys:
+            self.assertEqual(self.last_array.insert(key, "new"), UPDATED)
+        self.assertEqual(self.last_array._count, count)
+        for key in keys:
+            self.assertEqual(self.last_array.search(key), "new")
+            
+    def test_insert_full(self):
+        """Test that insertion reports FULL once a key has no room."""
+        statuses = [self.last_array.insert(i, i) for i in range(2 * self.last_array._size)]
+        self.assertIn(FULL, statuses)
+        self.assertEqual(statuses.count(INSERTED), self.last_array._count)
+        
+    def test_strided_int_keys(self):
+        """Test that int keys sharing their low bits still spread out."""
+        last_array = LastSubArray(4096)
+        n = 3500
+        inserted = sum(1 for i in range(n) if last_array.insert(i * 1024, i))
+        self.assertGreater(inserted / n, 0.95)
+        for i in range(n):
+            if i % 97 == 0:
+                self.assertEqual(last_array.search(i * 1024), i)
+        
     def test_load_factor(self):
         """Test load factor calculation."""
         self.assertEqual(self.last_array.load_factor, 0.0)
@@ -95,6 +259,13 @@ class TestOpenAddressHashTable(unittest.TestCase):
         self.assertEqual(self.hash_table._count, 0)
         self.assertGreater(len(self.hash_table._subarrays), 0)
         
+    def test_non_power_of_two_size(self):
+        """Test that subarrays stay within a non-power-of-two initial size."""
+        hash_table = OpenAddressHashTable(initial_size=100, delta=0.01)
+        sizes = [subarray._size for subarray in hash_table._subarrays]
+        self.assertEqual(sizes, [32, 16])
+        self.assertEqual(hash_table._last_array._size, 52)
+        
     def test_insert_and_search(self):
         """Test basic insertion and search operations."""
         # Test single insertion
@@ -113,6 +284,105 @@ class TestOpenAddressHashTable(unittest.TestCase):
         # Test search for non-existent key
         self.assertIsNone(self.hash_table.search("nonexistent"))
         
+    def test_insert_many_and_search_many(self):
+        """Test batch insertion and search operations."""
+        keys = [f"key{i}" for i in range(10)]
+        values = [f"value{i}" for i in range(10)]
+        self.assertEqual(self.hash_table.insert_many(keys, values), [True] * 10)
+        self.assertEqual(self.hash_table.search_many(keys + ["nonexistent"]), values + [None])
+        
+    def test_insert_many_length_mismatch(self):
+        """Test that batch insertion rejects keys and values of different lengths."""
+        with self.assertRaises(ValueError):
+            self.hash_table.insert_many(["a", "b", "c"], [1])
+        with self.assertRaises(ValueError):
+            self.hash_table.insert_many(["a"], [1, 2])
+            
+    def test_flat_layout(self):
+        """Test the single-table flat layout."""
+        hash_table = OpenAddressHashTable(initial_size=50, layout="flat")
+        self.assertEqual(hash_table._size, 64)
+        self.assertEqual(len(hash_table._subarrays), 1)
+        self.assertIsNone(hash_table._last_array)
+        
+        n = int(hash_table._size * 0.85)
+        for i in range(n):
+            self.assertTrue(hash_table.insert(f"key{i}", f"value{i}"))
+        self.assertTrue(hash_table.insert("key0", "updated"))
+        self.assertEqual(hash_table.load_factor, n / hash_table._size)
+        
+        self.assertEqual(hash_table.search("key0"), "updated")
+        for i in range(1, n):
+            self.assertEqual(hash_table.search(f"key{i}"), f"value{i}")
+        self.assertIsNone(hash_table.search("nonexistent"))
+        
+    def test_int_key_type(self):
+        """Test a table declared with int keys."""
+        hash_table = OpenAddressHashTable(initial_size=64, delta=0.1, key_type=int)
+        self.assertTrue(all(isinstance(subarray, IntSubArray) for subarray in hash_table._subarrays))
+        
+        n = int(hash_table._size * 0.85)
+        results = hash_table.insert_many(range(n), (i * i for i in range(n)))
+        for i, inserted in enumerate(results):
+            if inserted:
+                self.assertEqual(hash_table.search(i), i * i)
+        self.assertGreater(sum(results) / n, 0.95)
+        
+    def test_int_key_type_out_of_range(self):
+        """Test that int keys outside the 64-bit range are rejected."""
+        hash_table = OpenAddressHashTable(initial_size=64, delta=0.1, key_type=int)
+        self.assertTrue(hash_table.insert(2**63 - 1, "max"))
+        self.assertTrue(hash_table.insert(-2**63, "min"))
+        for key in (2**63, -2**63 - 1, 2**70):
+            with self.assertRaises(ValueError):
+                hash_table.insert(key, "x")
+            self.assertIsNone(hash_table.search(key))
+        self.assertEqual(hash_table._count, 2)
+        
+    def test_int_key_type_wrong_type(self):
+        """Test that non-int keys are rejected on insert and not found on search."""
+        hash_table = OpenAddressHashTable(initial_size=64, delta=0.1, key_type=int)
+        self.assertTrue(hash_table.insert(2, "two"))
+        for key in ("a", 2.0, None):
+            with self.assertRaises(TypeError):
+                hash_table.insert(key, "x")
+            self.assertIsNone(hash_table.search(key))
+        self.assertEqual(hash_table._count, 1)
+        self.assertEqual(hash_table.search(2), "two")
+        
+    def test_strided_int_key_type(self):
+        """Test fill rate of int-specialized subarrays for strided keys."""
+        hash_table = OpenAddressHashTable(initial_size=1024, delta=0.1, key_type=int)
+        n = int(1024 * 0.85)
+        inserted = sum(1 for i in range(n) if hash_table.insert(i * 1024, i))
+        self.assertGreater(inserted / n, 0.95)
+        
+    def test_invalid_layout(self):
+        """Test that an unknown layout is rejected."""
+        with self.assertRaises(ValueError):
+            OpenAddressHashTable(layout="unknown")
+            
+    def test_update_existing_keys(self):
+        """Test that re-inserting keys updates them without adding items."""
+        n = int(self.hash_table._size * 0.85)
+        keys = [f"key{i}" for i in range(n)]
+        keys = [key for key in keys if self.hash_table.insert(key, "old")]
+        count = self.hash_table._count
+        
+        for key in keys:
+            self.assertTrue(self.hash_table.insert(key, "new"))
+        self.assertEqual(self.hash_table._count, count)
+        for key in keys:
+            self.assertEqual(self.hash_table.search(key), "new")
+            
+    def test_strided_int_keys(self):
+        """Test fill rate for int keys that share their low bits."""
+        for size, delta in [(1024, 0.1), (16384, 0.01)]:
+            hash_table = OpenAddressHashTable(initial_size=size, delta=delta)
+            n = int(size * 0.85)
+            inserted = sum(1 for i in range(n) if hash_table.insert(i * 1024, i))
+            self.assertGreater(inserted / n, 0.95)
+            
     def test_high_load_factor(self):
         """Test behavior with high load factor."""
         # Insert items until we reach close to (1-delta) load factor
@@ -131,6 +401,20 @@ class TestOpenAddressHashTable(unittest.TestCase):
         # Verify we could insert most items
         self.assertGreater(success_count / n, 0.95)
         
+    def test_max_load_follows_delta(self):
+        """Test that the table-level load limit is 1 - delta."""
+        hash_table = OpenAddressHashTable(initial_size=64, delta=0.5)
+        results = [hash_table.insert(f"key{i}", i) for i in range(64)]
+        self.assertEqual(hash_table._count, 32)
+        self.assertEqual(hash_table.load_factor, 0.5)
+        self.assertFalse(results[-1])
+        
+        # Keys already stored can still be updated at the limit
+        key = next(f"key{i}" for i, inserted in enumerate(results) if inserted)
+        self.assertTrue(hash_table.insert(key, "updated"))
+        self.assertEqual(hash_table.search(key), "updated")
+        self.assertEqual(hash_table._count, 32)
+        
     def test_random_operations(self):
         """Test random mix of insertions and searches."""
         random.seed(42)  # For reproducibility
@@ -153,18 +437,12 @@ class TestOpenAddressHashTable(unittest.TestCase):
         successful_inserts = set()  # Track successfully inserted keys
         for i, (op, key, value) in enumerate(operations):
             if op == "insert":
-                success = self.hash_table.insert(key, value)
-                print(f"Operation {i}: Insert {key}={value}, success={success}")
-                if success:
+                if self.hash_table.insert(key, value):
                     successful_inserts.add(key)
                     test_data[key] = value  # Update the value if insertion succeeded
-            else:  # search
-                if key in successful_inserts:  # Only check keys that were successfully inserted
-                    result = self.hash_table.search(key)
-                    print(f"Operation {i}: Search {key}, expected={test_data[key]}, got={result}")
-                    self.assertEqual(result, test_data[key])
-                else:
-                    print(f"Operation {i}: Search {key} skipped (not successfully inserted)")
+            elif key in successful_inserts:  # Only check keys that were successfully inserted
+                result = self.hash_table.search(key)
+                self.assertEqual(result, test_data[key], msg=f"Operation {i}: Search {key}")
                 
     def test_load_factor(self):
         """Test load factor calculation."""